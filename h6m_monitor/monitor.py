@@ -1,4 +1,5 @@
 import asyncio
+import logging
 from bleak import BleakClient, BleakScanner
 
 from .outputs import HeartRateOutputManager
@@ -9,6 +10,9 @@ from .tcp_server import HeartRateTCPServer
 # See https://www.bluetooth.com/wp-content/uploads/Files/Specification/HTML/Assigned_Numbers/out/en/Assigned_Numbers.pdf
 HR_MEASUREMENT_UUID = "00002a37-0000-1000-8000-00805f9b34fb"
 TARGET_NAME_SUBSTRING = "H6M"
+_TARGET_LOWER = TARGET_NAME_SUBSTRING.casefold()
+
+logger = logging.getLogger("h6m")
 
 
 class H6MHeartRateMonitor:
@@ -18,6 +22,7 @@ class H6MHeartRateMonitor:
         self.ble_timeout = ble_timeout
 
         self.latest_hr: int = 0
+        self._conn_params_request = None
 
         # Composition: delegate responsibilities
         self.outputs = HeartRateOutputManager(
@@ -30,51 +35,103 @@ class H6MHeartRateMonitor:
             self.tcp_server = HeartRateTCPServer(
                 host="127.0.0.1",
                 port=8888,
-                get_latest_hr=self.get_latest_hr,
             )
 
-    def get_latest_hr(self) -> int:
-        return self.latest_hr
-
     async def scan_ble_devices(self):
-        while True:
-            print(f"Scanning for BLE devices (timeout: {self.ble_timeout}s)...")
-            devices = await BleakScanner.discover(timeout=self.ble_timeout)
-
-            if devices:
-                for device in devices:
-                    if device.name and TARGET_NAME_SUBSTRING.lower() in device.name.lower():
-                        print(f"Found target device: {device.name} ({device.address})")
-                        return device
+        found = asyncio.Event()
+        target = None
+
+        def detection_callback(device, advertisement_data):
+            nonlocal target
+            if target is None and device.name and _TARGET_LOWER in device.name.casefold():
+                target = device
+                found.set()
+
+        # One scanner for all retries, so the backend watcher is registered only once
+        scanner = BleakScanner(detection_callback=detection_callback)
+        print(f"Scanning for BLE devices (timeout: {self.ble_timeout}s)...")
+        await scanner.start()
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(found.wait(), timeout=self.ble_timeout)
+                except asyncio.TimeoutError:
+                    print("No target BLE devices found, still scanning... (Ctrl+C to quit)")
+                    continue
 
-            print("No target BLE devices found, retrying in 5 seconds... (Ctrl+C to quit)")
-            await asyncio.sleep(5)
+                print(f"Found target device: {target.name} ({target.address})")
+                return target
+        finally:
+            await scanner.stop()
 
     def hr_measurement_handler(self, sender: int, data: bytearray):
         hr = self.parse_heart_rate(data)
         if hr is not None:
+            # Only report changes, stable readings would just repeat the same line
+            if hr != self.latest_hr:
+                logger.info("Heart Rate: %d bpm", hr)
             self.latest_hr = hr
-            print(f"Heart Rate: {hr} bpm")
             self.outputs.write_heart_rate(hr)
+            if self.tcp_server is not None:
+                self.tcp_server.publish(hr)
         else:
-            print(f"Failed to parse heart rate data: {data.hex()}")
+            logger.warning("Failed to parse heart rate data: %s", data.hex())
 
     @staticmethod
     def parse_heart_rate(data: bytearray):
-        if not data:
+        n = len(data)
+        if n < 2:
             return None
 
-        flags = data[0]
-        hr_format = flags & 0x01
+        # Flags bit 0 selects a uint16 value; combine the two bytes without slicing
+        if data[0] & 0x01:
+            return (data[1] | (data[2] << 8)) if n >= 3 else None
+        return data[1]
+
+    @staticmethod
+    async def negotiate_mtu(client: BleakClient):
+        # Only the BlueZ backend exposes MTU acquisition; WinRT/CoreBluetooth negotiate it on connect
+        acquire_mtu = getattr(getattr(client, "_backend", None), "_acquire_mtu", None)
+        if acquire_mtu is not None:
+            try:
+                await acquire_mtu()
+            except Exception as e:
+                print(f"MTU negotiation not supported: {e}")
+
+        print(f"Using ATT MTU of {client.mtu_size} bytes")
+
+    def request_low_latency(self, client: BleakClient):
+        # Only WinRT exposes preferred connection parameters (Windows 11+); BlueZ has no D-Bus API for it
+        requester = getattr(getattr(client, "_backend", None), "_requester", None)
+        if requester is None or not hasattr(requester, "request_preferred_connection_parameters"):
+            return
+
+        self.release_low_latency()
+        try:
+            from winrt.windows.devices.bluetooth import (
+                BluetoothLEPreferredConnectionParameters,
+                BluetoothLEPreferredConnectionParametersRequestStatus,
+            )
 
-        if hr_format == 0:
-            if len(data) >= 2:
-                return data[1]
+            # The request only holds while this object stays open
+            request = requester.request_preferred_connection_parameters(
+                BluetoothLEPreferredConnectionParameters.throughput_optimized
+            )
+        except Exception as e:
+            print(f"Connection parameter request not supported: {e}")
+            return
+
+        if request.status == BluetoothLEPreferredConnectionParametersRequestStatus.SUCCESS:
+            self._conn_params_request = request
+            print("Requested low-latency connection parameters")
         else:
-            if len(data) >= 3:
-                return int.from_bytes(data[1:3], byteorder="little")
+            request.close()
+            print(f"Low-latency connection parameters rejected: {request.status.name}")
 
-        return None
+    def release_low_latency(self):
+        if self._conn_params_request is not None:
+            self._conn_params_request.close()
+            self._conn_params_request = None
 
     async def run(self):
         device = await self.scan_ble_devices()
@@ -98,15 +155,23 @@ class H6MHeartRateMonitor:
 
                         print(f"Connected to {device.name} ({device.address})")
 
-                        print("Subscribing to Heart Rate Measurement notifications...")
-                        await client.start_notify(HR_MEASUREMENT_UUID, self.hr_measurement_handler)
+                        try:
+                            # Settle the MTU before notifications start flowing
+                            await self.negotiate_mtu(client)
+                            self.request_low_latency(client)
+
+                            print("Subscribing to Heart Rate Measurement notifications...")
+                            await client.start_notify(HR_MEASUREMENT_UUID, self.hr_measurement_handler)
 
-                        print("Listening for heart rate data... Press Ctrl+C to stop.")
+                            print("Listening for heart rate data... Press Ctrl+C to stop.")
 
-                        while True:
-                            if not client.is_connected:
-                                raise ConnectionError("BLE connection lost")
-                            await asyncio.sleep(1)
+                            while True:
+                                if not client.is_connected:
+                                    raise ConnectionError("BLE connection lost")
+                                await asyncio.sleep(1)
+                        finally:
+                            # Drop the connection parameter request along with the connection
+                            self.release_low_latency()
 
                 except asyncio.CancelledError:
                     task = asyncio.current_task()
@@ -115,11 +180,13 @@ class H6MHeartRateMonitor:
                         raise
 
                     print("BLE operation cancelled unexpectedly. Reconnecting in 5 seconds...")
+                    self.outputs.flush()
                     await asyncio.sleep(5)
 
                 except Exception as e:
                     print(f"Connection error: {e}")
                     print("Reconnecting in 5 seconds...")
+                    self.outputs.flush()
                     await asyncio.sleep(5)
 
         finally:
@@ -1,50 +1,114 @@
-import csv
+import concurrent.futures
 import os
+import time
 from datetime import datetime
 
+# strftime is only re-run when the wall-clock second changes
+_last_sec = 0
+_last_str = ""
+
+
+def _format_ts(ts: float) -> str:
+    global _last_sec, _last_str
+    sec = int(ts)
+    if sec != _last_sec:
+        _last_sec = sec
+        _last_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+    return _last_str
+
 
 class HeartRateOutputManager:
-    def __init__(self, enable_txt_output: bool, enable_csv_output: bool):
+    def __init__(self, enable_txt_output: bool, enable_csv_output: bool,
+                 flush_every_n: int = 30, flush_every_s: float = 10.0):
         self.enable_txt_output = enable_txt_output
         self.enable_csv_output = enable_csv_output
 
-        self.txt_file = None
+        # CSV rows are only flushed once either threshold is crossed
+        self.flush_every_n = flush_every_n
+        self.flush_every_s = flush_every_s
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+        # heart_rate.txt is rewritten in place from one reused fixed-width buffer
+        self._txt_fd: int | None = None
+        self._txt_buf = bytearray(b"  0 bpm")
         self.csv_file = None
-        self.csv_writer = None
+
+        # Single worker keeps writes ordered while taking disk I/O off the event loop
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
 
     def open_files(self):
+        if self.enable_txt_output or self.enable_csv_output:
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="hr-io")
+
         if self.enable_txt_output:
-            self.txt_file = open("heart_rate.txt", "w")
+            flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+            self._txt_fd = os.open("heart_rate.txt", flags, 0o644)
             print("Text output enabled. Writing to heart_rate.txt")
 
         if self.enable_csv_output:
             os.makedirs("logs", exist_ok=True)
             timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
             csv_filename = f"logs/heart_rate_{timestamp}.csv"
-            self.csv_file = open(csv_filename, "w", newline="")
-            self.csv_writer = csv.writer(self.csv_file)
-            self.csv_writer.writerow(["timestamp", "bpm"])
+            self.csv_file = open(csv_filename, "w", newline="", buffering=65536)
+            self.csv_file.write("timestamp,bpm\n")
             print(f"CSV output enabled. Writing to {csv_filename}")
 
     def write_heart_rate(self, hr: int):
-        if self.enable_txt_output and self.txt_file:
-            self.txt_file.seek(0)
-            self.txt_file.write(f"{hr} bpm")
-            self.txt_file.truncate()
-            self.txt_file.flush()
-
-        if self.enable_csv_output and self.csv_file and self.csv_writer:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.csv_writer.writerow([timestamp, hr])
+        if self._executor is not None:
+            future = self._executor.submit(self._write_sync, hr, time.time())
+            future.add_done_callback(self._report_write_error)
+
+    @staticmethod
+    def _report_write_error(future: concurrent.futures.Future):
+        error = future.exception()
+        if error is not None:
+            print(f"Failed to write heart rate output: {error}")
+
+    def _write_sync(self, hr: int, ts: float):
+        if self.enable_txt_output and self._txt_fd is not None:
+            # Fixed-width payload, so overwriting in place never needs a truncate;
+            # clamping keeps the buffer at its original length for uint16 readings
+            self._txt_buf[0:3] = b"%3d" % min(hr, 999)
+            if hasattr(os, "pwrite"):
+                os.pwrite(self._txt_fd, self._txt_buf, 0)
+            else:
+                os.lseek(self._txt_fd, 0, os.SEEK_SET)
+                os.write(self._txt_fd, self._txt_buf)
+
+        if self.enable_csv_output and self.csv_file:
+            self.csv_file.write(f"{_format_ts(ts)},{hr}\n")
+            self._pending += 1
+
+            if self._pending >= self.flush_every_n or time.monotonic() - self._last_flush >= self.flush_every_s:
+                self._flush_sync()
+
+    def flush(self):
+        # Lets callers push buffered CSV rows out while no samples arrive, e.g. during a BLE outage
+        if self._executor is not None:
+            future = self._executor.submit(self._flush_sync)
+            future.add_done_callback(self._report_write_error)
+
+    def _flush_sync(self):
+        if self.csv_file and self._pending:
             self.csv_file.flush()
+            self._pending = 0
+            self._last_flush = time.monotonic()
 
     def close_files(self):
-        if self.txt_file:
-            self.txt_file.close()
-            self.txt_file = None
+        # Drain pending writes before the files go away
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        if self._txt_fd is not None:
+            os.close(self._txt_fd)
+            self._txt_fd = None
             print("Text file closed.")
 
         if self.csv_file:
+            self.csv_file.flush()
+            os.fsync(self.csv_file.fileno())
             self.csv_file.close()
             self.csv_file = None
             print("CSV file closed.")
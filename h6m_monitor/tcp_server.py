@@ -1,48 +1,82 @@
 import asyncio
-from typing import Callable, Set
+import socket
+import weakref
+
+# A client that cannot accept a sample within this many seconds is dropped
+SEND_TIMEOUT = 2.0
 
 
 class HeartRateTCPServer:
-    def __init__(self, host: str, port: int, get_latest_hr: Callable[[], int]):
+    def __init__(self, host: str, port: int):
         self.host = host
         self.port = port
-        self.get_latest_hr = get_latest_hr
 
-        self.tcp_clients: Set[asyncio.StreamWriter] = set()
+        self._encoded: bytes = b""
+        self._hr_event = asyncio.Event()
+
+        self.tcp_clients: weakref.WeakSet[asyncio.StreamWriter] = weakref.WeakSet()
         self.server: asyncio.AbstractServer | None = None
         self.broadcast_task: asyncio.Task | None = None
 
     async def handle_tcp_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
         print("New TCP client connected.")
+
+        # Send tiny BPM updates immediately and detect dead peers
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        writer.transport.set_write_buffer_limits(high=16 * 1024, low=4 * 1024)
+
         self.tcp_clients.add(writer)
 
         try:
-            while True:
-                await asyncio.sleep(0.1) # Keep TCP Connection alive
-        except Exception:
+            # Block until the peer sends something or closes; EOF ends the loop
+            while not reader.at_eof():
+                data = await reader.read(256)
+                if not data:
+                    break
+        except OSError:
+            # Covers resets and keepalive timeouts (ETIMEDOUT surfaces as TimeoutError)
             pass
         finally:
-            if writer in self.tcp_clients:
-                self.tcp_clients.remove(writer)
-            writer.close()
-            await writer.wait_closed()
+            await self._drop_client(writer)
             print("TCP client disconnected.")
 
+    def publish(self, hr: int):
+        # Encoded once and shared by every client write
+        self._encoded = f"{hr}\n".encode("ascii")
+        self._hr_event.set()
+
+    async def _send(self, writer: asyncio.StreamWriter):
+        writer.write(self._encoded)
+        # Bounded so one stalled peer cannot hold up the broadcast for everyone else
+        await asyncio.wait_for(writer.drain(), SEND_TIMEOUT)
+
+    async def _drop_client(self, writer: asyncio.StreamWriter):
+        self.tcp_clients.discard(writer)
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+
     async def _broadcast_loop(self):
+        # Wakes only when publish() delivers a new sample
         while True:
-            if self.tcp_clients:
-                hr = self.get_latest_hr()
-                message = f"{hr}\n".encode()
-                for writer in list(self.tcp_clients):
-                    try:
-                        writer.write(message)
-                        await writer.drain()
-                    except Exception:
-                        if writer in self.tcp_clients:
-                            self.tcp_clients.remove(writer)
-                        writer.close()
-                        await writer.wait_closed()
-            await asyncio.sleep(1)
+            await self._hr_event.wait()
+            self._hr_event.clear()
+            if not self.tcp_clients:
+                continue
+
+            writers = tuple(self.tcp_clients)
+            results = await asyncio.gather(*(self._send(w) for w in writers), return_exceptions=True)
+            failed = [w for w, result in zip(writers, results) if isinstance(result, Exception)]
+            if failed:
+                for writer in failed:
+                    # Discard unsent data, otherwise closing waits on the stalled peer
+                    writer.transport.abort()
+                await asyncio.gather(*(self._drop_client(w) for w in failed))
 
     async def start(self):
         self.server = await asyncio.start_server(
@@ -1,8 +1,15 @@
 import argparse
 import asyncio
+import logging
+import sys
 
 from h6m_monitor import H6MHeartRateMonitor
 
+try:
+    import uvloop  # Optional faster event loop, not available on Windows
+except ImportError:
+    uvloop = None
+
 
 async def main():
     parser = argparse.ArgumentParser(description="H6M BLE Heart Rate Monitor")
@@ -17,6 +24,8 @@ async def main():
     )
     args = parser.parse_args()
 
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
     monitor = H6MHeartRateMonitor(
         enable_tcp=args.tcp,
         enable_txt_output=args.txt,
@@ -27,4 +36,11 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is None:
+        asyncio.run(main())
+    elif hasattr(uvloop, "run"):
+        uvloop.run(main())
+    else:
+        # uvloop.run() only exists from uvloop 0.18 on, older releases go through the policy
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        asyncio.run(main())
@@ -0,0 +1,2 @@
+# tcp_receiver_test.py is a manual client that connects on import, not a pytest module
+collect_ignore = ["tcp_receiver_test.py"]
@@ -1,11 +1,11 @@
 import socket
+import sys
 
 s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 s.connect(("127.0.0.1", 8888))
 
-with s:
-    while True:
-        data = s.recv(1024)
-        if not data:
-            break
-        print("Received:", data.decode().strip())
\ No newline at end of file
+# Buffered line iteration handles values split across TCP segments
+with s, s.makefile("rb", buffering=65536) as f:
+    for line in f:
+        sys.stdout.buffer.write(b"Received: " + line)
+        sys.stdout.buffer.flush()
@@ -0,0 +1,32 @@
+import pytest
+
+from h6m_monitor import H6MHeartRateMonitor
+from h6m_monitor.outputs import HeartRateOutputManager
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        (b"", None),
+        (b"\x00", None),
+        (b"\x00\x48", 72),  # uint8 value
+        (b"\x16\x50\x00\x00", 80),  # uint8 value followed by RR interval
+        (b"\x01\x48", None),  # uint16 flag with a truncated value
+        (b"\x01\x48\x01", 328),  # uint16 value
+        (b"\x01\xe8\x03", 1000),
+    ],
+)
+def test_parse_heart_rate(data, expected):
+    assert H6MHeartRateMonitor.parse_heart_rate(bytearray(data)) == expected
+
+
+def test_txt_output_keeps_fixed_width(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    outputs = HeartRateOutputManager(enable_txt_output=True, enable_csv_output=False)
+    outputs.open_files()
+    try:
+        for hr, expected in [(75, b" 75 bpm"), (1000, b"999 bpm"), (72, b" 72 bpm")]:
+            outputs._write_sync(hr, 0.0)
+            assert (tmp_path / "heart_rate.txt").read_bytes() == expected
+    finally:
+        outputs.close_files()